@@ -7,13 +7,27 @@ Enterprise campaign processing with brand compliance validation
 """
 
 import os
+import re
 import sys
 import yaml
-import json
+import queue
+import atexit
 import logging
+import logging.handlers
 from pathlib import Path
 from dotenv import load_dotenv
 
+# Prefer libyaml's C loader; fall back to the pure-Python loader if PyYAML
+# was built without libyaml bindings
+try:
+    from yaml import CSafeLoader as SafeLoader
+    LIBYAML_AVAILABLE = True
+except ImportError:
+    from yaml import SafeLoader
+    LIBYAML_AVAILABLE = False
+
+ENV_VAR_PATTERN = re.compile(r'\$\{([A-Za-z_][A-Za-z0-9_]*)\}')
+
 # Load environment variables
 load_dotenv()
 
@@ -21,27 +35,37 @@ from src.campaign_processor import CampaignProcessor
 
 def setup_logging():
     """Setup enterprise logging"""
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter('{asctime} - {name} - {levelname} - {message}', style='{'))
+    
+    # Callers only enqueue records; a single listener thread formats and writes them
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, handler)
+    listener.start()
+    atexit.register(listener.stop)
+    
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter('{message}', style='{'))
+    
+    logging.basicConfig(level=logging.INFO, handlers=[queue_handler])
     return logging.getLogger(__name__)
 
 def load_config(config_path="config.yml"):
     """Load configuration with environment variable substitution"""
     
     with open(config_path, 'r') as f:
-        config = yaml.safe_load(f)
+        config = yaml.load(f, Loader=SafeLoader)
     
-    # Substitute environment variables
+    # Substitute "${VAR}" scalars after parsing so values never need YAML escaping;
+    # unset variables are left as-is
     def substitute_env_vars(obj):
         if isinstance(obj, dict):
             return {key: substitute_env_vars(value) for key, value in obj.items()}
         elif isinstance(obj, list):
             return [substitute_env_vars(item) for item in obj]
-        elif isinstance(obj, str) and obj.startswith("${") and obj.endswith("}"):
-            env_var = obj[2:-1]
-            return os.getenv(env_var, obj)
+        elif isinstance(obj, str):
+            match = ENV_VAR_PATTERN.fullmatch(obj)
+            return os.getenv(match.group(1), obj) if match else obj
         else:
             return obj
     
@@ -55,13 +79,16 @@ def load_campaign_brief(brief_path):
     
     # Explicitly use UTF-8 encoding to handle international characters
     with open(brief_path, 'r', encoding='utf-8') as f:
-        return yaml.safe_load(f)
+        return yaml.load(f, Loader=SafeLoader)
 
 def main():
     """Enhanced main execution function"""
     
     logger = setup_logging()
     
+    if not LIBYAML_AVAILABLE:
+        logger.warning("libyaml not available; using pure-Python YAML loader")
+    
     # Handle command line arguments
     if len(sys.argv) < 2:
         print("Usage: python main.py <campaign_brief.yml>")
@@ -83,49 +110,48 @@ def main():
         
         # Load campaign brief - ADD UTF-8 ENCODING HERE
         with open(campaign_brief_path, 'r', encoding='utf-8') as f:
-            campaign_brief = yaml.safe_load(f)
+            campaign_brief = yaml.load(f, Loader=SafeLoader)
         logger.info(f"Campaign brief loaded: {campaign_brief.get('campaign_name', 'Unknown')}")
         
-        # Initialize enterprise campaign processor
-        processor = CampaignProcessor(config)
-        
-        # Display campaign overview - REMOVE EMOJIS
-        print("\n" + "="*70)
-        print("ENTERPRISE CREATIVE AUTOMATION PIPELINE")
-        print("="*70)
-        print(f"Campaign: {campaign_brief.get('campaign_name', 'Unknown')}")
-        print(f"Products: {', '.join([p['name'] for p in campaign_brief.get('products', [])])}")
-        print(f"Region: {campaign_brief.get('target_region', 'Unknown')}")
-        print(f"Audience: {campaign_brief.get('target_audience', 'Unknown')}")
-        print(f"Message: {campaign_brief.get('campaign_message', 'No message')}")
-        
-        if campaign_brief.get("cultural_requirements"):
-            print(f"Cultural Requirements: {len(campaign_brief['cultural_requirements'])} specified")
-        if campaign_brief.get("brand_guidelines"):
-            print("Brand Guidelines: Specified")
-        
-        print("\nStarting enterprise campaign processing...")
-        print("="*70)
-        
-        # Process campaign with full compliance checking
-        campaign_result = processor.process_campaign(campaign_brief)
-        
-        # Generate and display comprehensive report
-        report = processor.generate_campaign_report(campaign_result)
-        print(report)
-        
-        # Save detailed results
-        results_dir = Path(config["directories"]["output"]) / campaign_result["campaign_name"]
-        results_dir.mkdir(parents=True, exist_ok=True)
-        
-        results_file = results_dir / "campaign_results.json"
-        with open(results_file, 'w', encoding='utf-8') as f:  # ADD UTF-8 HERE TOO
-            json.dump(campaign_result, f, indent=2, ensure_ascii=False)
-        
-        print(f"\nDetailed results saved to: {results_dir}")
+        # Initialize enterprise campaign processor; leaving the block shuts it down on any path
+        with CampaignProcessor(config) as processor:
+            # Display campaign overview - REMOVE EMOJIS
+            print("\n" + "="*70)
+            print("ENTERPRISE CREATIVE AUTOMATION PIPELINE")
+            print("="*70)
+            print(f"Campaign: {campaign_brief.get('campaign_name', 'Unknown')}")
+            print(f"Products: {', '.join([p['name'] for p in campaign_brief.get('products', [])])}")
+            print(f"Region: {campaign_brief.get('target_region', 'Unknown')}")
+            print(f"Audience: {campaign_brief.get('target_audience', 'Unknown')}")
+            print(f"Message: {campaign_brief.get('campaign_message', 'No message')}")
+            
+            if campaign_brief.get("cultural_requirements"):
+                print(f"Cultural Requirements: {len(campaign_brief['cultural_requirements'])} specified")
+            if campaign_brief.get("brand_guidelines"):
+                print("Brand Guidelines: Specified")
+            
+            print("\nStarting enterprise campaign processing...")
+            print("="*70)
+            
+            # Process campaign with full compliance checking
+            campaign_result = processor.process_campaign(campaign_brief)
+            
+            # Generate and display comprehensive report
+            report = processor.generate_campaign_report(campaign_result)
+            print(report)
+            
+            # Save detailed results
+            results_dir = Path(config["directories"]["output"]) / campaign_result["campaign_name"]
+            results_dir.mkdir(parents=True, exist_ok=True)
+            
+            results_file = results_dir / "campaign_results.json"
+            results_file.write_bytes(processor.serialize_result(campaign_result))
+            
+            print(f"\nDetailed results saved to: {results_dir}")
+            
+            # Display processing metrics
+            metrics = processor.get_processing_metrics()
         
-        # Display processing metrics
-        metrics = processor.get_processing_metrics()
         print(f"\nSYSTEM PERFORMANCE METRICS:")
         print(f"Campaigns Processed: {metrics['campaigns_processed']}")
         print(f"Average Processing Time: {metrics['average_processing_time']}s")
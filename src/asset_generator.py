@@ -3,30 +3,163 @@ Multi-Provider Asset Generator with Demo-Reliable Fallbacks
 """
 
 import os
+import asyncio
+import math
+import json
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import time
 import hashlib
+import functools
+import threading
+import uuid
+import weakref
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
+import numpy as np
 from PIL import Image, ImageDraw, ImageFont
-from openai import OpenAI
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple, Callable
 import logging
 
+
+@functools.lru_cache(maxsize=256)
+def _build_prompt(product_name: str, target_region: str, target_audience: str) -> str:
+    """Build AI generation prompt, shared across all aspect ratios of a product"""
+    
+    prompt_parts = [
+        f"Professional product photography of {product_name}",
+        f"for {target_audience} in {target_region}",
+        "high quality, clean background",
+        "suitable for social media marketing"
+    ]
+    
+    return ", ".join(prompt_parts)
+
+
+def _openai_size(width: int, height: int) -> str:
+    """Map target dimensions to the nearest DALL-E 3 supported size"""
+    
+    if width == height:
+        return "1024x1024"
+    elif width > height:
+        return "1792x1024"
+    else:
+        return "1024x1792"
+
+
+def _openai_image_params(prompt: str, size: str) -> Dict[str, Any]:
+    """DALL-E 3 image generation request arguments"""
+    
+    return {
+        "model": "dall-e-3",
+        "prompt": prompt,
+        "size": size,
+        "quality": "standard",  # Use standard for faster generation
+        "n": 1
+    }
+
+
+@functools.lru_cache(maxsize=8)
+def _radial_distance(width: int, height: int) -> np.ndarray:
+    """Distance of every pixel from the image center, cached per canvas size"""
+    
+    yy, xx = np.ogrid[:height, :width]
+    distance = np.hypot(xx - width // 2, yy - height // 2).astype(np.float32)
+    distance.setflags(write=False)  # Shared across worker threads
+    return distance
+
+
+def _radial_highlight_numpy(width: int, height: int, background: np.ndarray,
+                            highlight: np.ndarray, radius: float) -> np.ndarray:
+    """Blend from highlight at the center to background at radius (vectorized NumPy)"""
+    
+    glow = (1 - _radial_distance(width, height) / radius).clip(0, 1)[..., None]
+    return (background + glow * (highlight - background)).astype(np.uint8)
+
+
+# Use a Numba-compiled kernel when available, degrading to pure NumPy otherwise
+try:
+    from numba import njit
+    
+    # Serial kernel: generator threads already render assets concurrently, and Numba's
+    # workqueue threading layer aborts on concurrent calls into parallel kernels
+    @njit(cache=True)
+    def _radial_highlight(width, height, background, highlight, radius):
+        """Blend from highlight at the center to background at radius (single fused loop)"""
+        
+        out = np.empty((height, width, 3), np.uint8)
+        center_x, center_y = width // 2, height // 2
+        for y in range(height):
+            for x in range(width):
+                glow = 1.0 - math.sqrt((x - center_x) ** 2 + (y - center_y) ** 2) / radius
+                glow = min(max(glow, 0.0), 1.0)
+                for c in range(3):
+                    out[y, x, c] = np.uint8(background[c] + glow * (highlight[c] - background[c]))
+        return out
+    
+    NUMBA_AVAILABLE = True
+except ImportError:
+    _radial_highlight = _radial_highlight_numpy
+    NUMBA_AVAILABLE = False
+
+
+@functools.lru_cache(maxsize=None)
+def _default_font() -> ImageFont.ImageFont:
+    """Process-wide default font"""
+    return ImageFont.load_default()
+
+
+@functools.lru_cache(maxsize=512)
+def _text_bbox(text: str) -> tuple:
+    """Bounding box of text drawn at the origin in the default font"""
+    return ImageDraw.Draw(Image.new('RGB', (1, 1))).textbbox((0, 0), text, font=_default_font())
+
+
+def _text_size(text: str) -> tuple:
+    """(width, height) of text in the default font"""
+    
+    x0, y0, x1, y1 = _text_bbox(text)
+    return x1 - x0, y1 - y0
+
+
+# Called with (product_name, aspect_ratio, asset_info) as each asset completes
+AssetCallback = Callable[[str, str, Dict[str, Any]], None]
+
+# Serializes fallback asset creation across generator instances
+_FALLBACK_LOCK = threading.Lock()
+
+
 class AssetGenerator:
     """Generates creative assets with bulletproof fallback strategy"""
     
+    # Fallback directories already populated in this process
+    _fallback_dirs_ready = set()
+    
     def __init__(self, config: Dict[str, Any]):
         self.config = config
         self.logger = logging.getLogger(__name__)
         
-        # Initialize OpenAI if available
-        self.openai_client = None
-        if config["ai_providers"]["openai"]["enabled"] and config["ai_providers"]["openai"]["api_key"]:
-            try:
-                self.openai_client = OpenAI(api_key=config["ai_providers"]["openai"]["api_key"])
-                self.logger.info("OpenAI client initialized")
-            except Exception as e:
-                self.logger.warning(f"OpenAI initialization failed: {e}")
+        # Shared HTTP session so concurrent downloads reuse pooled connections
+        pool_size = max(1, config["ai_providers"].get("concurrency", 8))
+        adapter = HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+        )
+        self._http = requests.Session()
+        self._http.mount("https://", adapter)
+        self._http.mount("http://", adapter)
+        
+        # Per cache path locks, so aspect ratios sharing a (prompt, size) generate it once
+        self._generation_locks = {}
+        self._generation_locks_guard = threading.Lock()
+        
+        # Async counterpart, per event loop since asyncio locks bind to the loop that uses them
+        self._async_generation_locks = weakref.WeakKeyDictionary()
+        
+        # Guards lazy provider client creation
+        self._client_lock = threading.Lock()
         
         # Set up directories
         self.cache_dir = Path(config["directories"]["cache"])
@@ -39,15 +172,199 @@ class AssetGenerator:
         
         # Aspect ratio configs
         self.aspect_configs = config["aspect_ratios"]
+        self._openai_size_map = {
+            aspect_key: _openai_size(aspect_config["width"], aspect_config["height"])
+            for aspect_key, aspect_config in self.aspect_configs.items()
+        }
+        if self.logger.isEnabledFor(logging.DEBUG):
+            size_mapping = ", ".join(
+                f"{aspect_key}: {size} -> {aspect_config['width']}x{aspect_config['height']}"
+                for (aspect_key, size), aspect_config in zip(self._openai_size_map.items(), self.aspect_configs.values())
+            )
+            self.logger.debug("OpenAI size mapping (generated -> target): %s", size_mapping)
+        
+        # Fallback/emergency card renderers per aspect ratio
+        self._card_renderers = {
+            aspect_key: self._make_card_renderer(aspect_config["width"], aspect_config["height"])
+            for aspect_key, aspect_config in self.aspect_configs.items()
+        }
         
-        # Initialize fonts
-        self.font = ImageFont.load_default()
+        # Campaign message baseline per aspect ratio, measured up from the bottom edge
+        text_y_offsets = {
+            "story": 200,      # 9:16 - vertical
+            "landscape": 120   # 16:9 - horizontal
+        }
+        self._text_y_positions = {
+            aspect_key: aspect_config["height"] - text_y_offsets.get(aspect_key, 150)  # 1:1 - square
+            for aspect_key, aspect_config in self.aspect_configs.items()
+        }
+        
+    @functools.cached_property
+    def openai_client(self) -> Optional[Any]:
+        """OpenAI client, created on first use (None when disabled or unavailable)"""
+        return self._lazy_client("openai_client", "OpenAI")
+    
+    @functools.cached_property
+    def async_openai_client(self) -> Optional[Any]:
+        """Async OpenAI client for generate_campaign_assets_async, created on first use"""
+        return self._lazy_client("async_openai_client", "AsyncOpenAI")
+    
+    def _lazy_client(self, name: str, client_class: str) -> Optional[Any]:
+        """Build a provider client once, even when generator threads read it concurrently
+        
+        cached_property has no lock of its own since Python 3.12, so the client is stored
+        on the instance under _client_lock and later reads never reach here.
+        """
+        
+        with self._client_lock:
+            if name not in self.__dict__:
+                self.__dict__[name] = self._create_openai_client(client_class)
+            return self.__dict__[name]
+    
+    def _create_openai_client(self, client_class: str) -> Optional[Any]:
+        """Instantiate an openai client class (None when disabled or unavailable)"""
+        
+        openai_config = self.config["ai_providers"]["openai"]
+        if not (openai_config["enabled"] and openai_config["api_key"]):
+            return None
+        
+        try:
+            import openai
+            
+            client = getattr(openai, client_class)(api_key=openai_config["api_key"])
+            self.logger.info("%s client initialized", client_class)
+            return client
+        except Exception as e:
+            self.logger.warning("%s initialization failed: %s", client_class, e)
+            return None
+    
+    @property
+    def font(self) -> ImageFont.ImageFont:
+        """Overlay and fallback font, shared across instances and loaded on first use"""
+        return _default_font()
+    
+    def prepare(self):
+        """Create some fallback assets if they don't exist and warm up compiled kernels"""
         
-        # Create some fallback assets if they don't exist
         self._ensure_fallback_assets()
+        
+        if NUMBA_AVAILABLE:
+            # Trigger JIT compilation (or load from cache) before the first real render
+            _radial_highlight(2, 2, np.zeros(3, np.float32), np.zeros(3, np.float32), 1.0)
+    
+    def close(self):
+        """Release pooled HTTP connections and provider clients"""
+        
+        self._http.close()
+        
+        # Only clients that were actually created; cached_property stores them on the instance
+        client = self.__dict__.pop("openai_client", None)
+        if client is not None:
+            client.close()
+        
+        async_client = self.__dict__.get("async_openai_client")
+        if async_client is not None:
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                del self.__dict__["async_openai_client"]
+                asyncio.run(async_client.close())
+            else:
+                # Can't block on the loop we're running in; the caller must await aclose() instead
+                self.logger.warning("close() called inside a running event loop; use 'await aclose()' "
+                                    "to close the async OpenAI client")
+    
+    async def aclose(self):
+        """Close the async OpenAI client on the running loop, then release everything else"""
+        
+        async_client = self.__dict__.pop("async_openai_client", None)
+        if async_client is not None:
+            await async_client.close()
+        
+        self.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
+    
+    def generate_campaign_assets(self, campaign_brief: Dict[str, Any],
+                                 on_asset: Optional[AssetCallback] = None) -> Dict[str, Any]:
+        """Generate all assets for a campaign
+        
+        on_asset, if given, is called with (product_name, aspect_ratio, asset_info) as each
+        asset finishes, so downstream stages can start before the whole campaign is done.
+        """
+        
+        results, tasks = self._plan_campaign_assets(campaign_brief)
+        asset_infos = [None] * len(tasks)
+        
+        # Generation is I/O-bound (provider HTTP calls + disk), so fan out on threads
+        concurrency = self.config["ai_providers"].get("concurrency", 8)
+        with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(tasks)))) as executor:
+            futures = {
+                executor.submit(self._generate_single_asset, campaign_brief, product, aspect_key): index
+                for index, (product, aspect_key) in enumerate(tasks)
+            }
+            
+            for future in as_completed(futures):
+                index = futures[future]
+                product, aspect_key = tasks[index]
+                
+                try:
+                    outcome = future.result()
+                except Exception as e:
+                    outcome = e
+                
+                asset_infos[index] = self._asset_info(product["name"], aspect_key, outcome)
+                if on_asset:
+                    on_asset(product["name"], aspect_key, asset_infos[index])
+        
+        # Record in task order so the result layout stays deterministic
+        for (product, aspect_key), asset_info in zip(tasks, asset_infos):
+            self._record_asset_result(results, product, aspect_key, asset_info)
+        
+        return results
+    
+    async def generate_campaign_assets_async(self, campaign_brief: Dict[str, Any],
+                                             on_asset: Optional[AssetCallback] = None) -> Dict[str, Any]:
+        """Generate all assets for a campaign on the running event loop"""
+        
+        results, tasks = self._plan_campaign_assets(campaign_brief)
+        
+        # Bound in-flight provider calls the same way the thread pool does
+        semaphore = asyncio.Semaphore(max(1, self.config["ai_providers"].get("concurrency", 8)))
+        
+        async def generate(product, aspect_key):
+            async with semaphore:
+                try:
+                    outcome = await self._generate_single_asset_async(campaign_brief, product, aspect_key)
+                except Exception as e:
+                    outcome = e
+            
+            asset_info = self._asset_info(product["name"], aspect_key, outcome)
+            if on_asset:
+                on_asset(product["name"], aspect_key, asset_info)
+            return asset_info
+        
+        asset_infos = await asyncio.gather(
+            *(generate(product, aspect_key) for product, aspect_key in tasks)
+        )
+        
+        for (product, aspect_key), asset_info in zip(tasks, asset_infos):
+            self._record_asset_result(results, product, aspect_key, asset_info)
+        
+        return results
     
-    def generate_campaign_assets(self, campaign_brief: Dict[str, Any]) -> Dict[str, Any]:
-        """Generate all assets for a campaign"""
+    def _plan_campaign_assets(self, campaign_brief: Dict[str, Any]) -> Tuple[Dict[str, Any], List[tuple]]:
+        """Build the empty results structure and one task per (product, aspect ratio) pair"""
         
         results = {
             "campaign_name": campaign_brief.get("campaign_name", "unknown"),
@@ -60,39 +377,46 @@ class AssetGenerator:
             }
         }
         
-        # Process each product
+        tasks = []
         for product in campaign_brief.get("products", []):
             product_name = product["name"]
             results["assets"][product_name] = {}
             
-            self.logger.info(f"Generating assets for product: {product_name}")
+            self.logger.info("Generating assets for product: %s", product_name)
             
-            # Generate each aspect ratio
-            for aspect_key, aspect_config in self.aspect_configs.items():
-                results["generation_summary"]["total_requested"] += 1
-                
-                try:
-                    asset_path = self._generate_single_asset(
-                        campaign_brief, product, aspect_key
-                    )
-                    
-                    results["assets"][product_name][aspect_key] = {
-                        "path": asset_path,
-                        "status": "success",
-                        "aspect_ratio": aspect_config["ratio"]
-                    }
-                    results["generation_summary"]["successful"] += 1
-                    
-                except Exception as e:
-                    self.logger.error(f"Failed to generate {product_name}_{aspect_key}: {e}")
-                    results["assets"][product_name][aspect_key] = {
-                        "path": None,
-                        "status": "failed",
-                        "error": str(e)
-                    }
-                    results["generation_summary"]["failed"] += 1
+            for aspect_key in self.aspect_configs:
+                tasks.append((product, aspect_key))
         
-        return results
+        results["generation_summary"]["total_requested"] = len(tasks)
+        
+        return results, tasks
+    
+    def _asset_info(self, product_name: str, aspect_key: str, outcome: Any) -> Dict[str, Any]:
+        """Describe an asset path, or the exception that prevented it"""
+        
+        if isinstance(outcome, BaseException):
+            self.logger.error("Failed to generate %s_%s: %s", product_name, aspect_key, outcome)
+            return {
+                "path": None,
+                "status": "failed",
+                "error": str(outcome)
+            }
+        
+        return {
+            "path": outcome,
+            "status": "success",
+            "aspect_ratio": self.aspect_configs[aspect_key]["ratio"]
+        }
+    
+    def _record_asset_result(self, results: Dict[str, Any], product: Dict[str, Any],
+                             aspect_key: str, asset_info: Dict[str, Any]):
+        """Record an asset in the results and update the generation summary"""
+        
+        results["assets"][product["name"]][aspect_key] = asset_info
+        if asset_info["status"] == "success":
+            results["generation_summary"]["successful"] += 1
+        else:
+            results["generation_summary"]["failed"] += 1
     
     def _generate_single_asset(self, campaign_brief: Dict[str, Any], 
                               product: Dict[str, Any], aspect_ratio: str) -> str:
@@ -103,13 +427,33 @@ class AssetGenerator:
             try:
                 return self._generate_with_openai(campaign_brief, product, aspect_ratio)
             except Exception as e:
-                self.logger.warning(f"OpenAI generation failed: {e}")
+                self.logger.warning("OpenAI generation failed: %s", e)
+        
+        return self._generate_offline_asset(campaign_brief, product, aspect_ratio)
+    
+    async def _generate_single_asset_async(self, campaign_brief: Dict[str, Any],
+                                           product: Dict[str, Any], aspect_ratio: str) -> str:
+        """Generate single asset with fallback chain, awaiting provider calls"""
+        
+        # Step 1: Try OpenAI DALL-E 3
+        if self.async_openai_client:
+            try:
+                return await self._generate_with_openai_async(campaign_brief, product, aspect_ratio)
+            except Exception as e:
+                self.logger.warning("OpenAI generation failed: %s", e)
+        
+        # Remaining steps are local PIL work; keep it off the event loop
+        return await asyncio.to_thread(self._generate_offline_asset, campaign_brief, product, aspect_ratio)
+    
+    def _generate_offline_asset(self, campaign_brief: Dict[str, Any],
+                                product: Dict[str, Any], aspect_ratio: str) -> str:
+        """Fallback chain steps that need no remote provider"""
         
         # Step 2: Try Stability AI (placeholder for now)
         try:
             return self._generate_with_stability(campaign_brief, product, aspect_ratio)
         except Exception as e:
-            self.logger.warning(f"Stability AI generation failed: {e}")
+            self.logger.warning("Stability AI generation failed: %s", e)
         
         # Step 3: Use pre-generated fallback
         return self._use_fallback_asset(product, aspect_ratio)
@@ -118,51 +462,131 @@ class AssetGenerator:
                              product: Dict[str, Any], aspect_ratio: str) -> str:
         """Generate with OpenAI DALL-E 3"""
         
-        # Create prompt
-        prompt = self._create_prompt(campaign_brief, product)
+        prompt, size, cache_path = self._openai_request(campaign_brief, product, aspect_ratio)
         
-        # Get size configuration
-        config = self.aspect_configs[aspect_ratio]
+        with self._generation_lock(cache_path):
+            if not self._use_cached_generation(cache_path, prompt):
+                response = self.openai_client.images.generate(**_openai_image_params(prompt, size))
+                self._store_generation(response, cache_path, prompt, size)
         
-        # Map to OpenAI supported sizes
-        if config["width"] == config["height"]:
-            size = "1024x1024"
-        elif config["width"] > config["height"]:
-            size = "1792x1024"
-        else:
-            size = "1024x1792"
+        return self._finish_openai_generation(cache_path, campaign_brief, product, aspect_ratio)
+    
+    async def _generate_with_openai_async(self, campaign_brief: Dict[str, Any],
+                                          product: Dict[str, Any], aspect_ratio: str) -> str:
+        """Generate with OpenAI DALL-E 3 using the async client"""
         
-        self.logger.info(f"Generating with OpenAI: {prompt[:100]}...")
+        prompt, size, cache_path = self._openai_request(campaign_brief, product, aspect_ratio)
+        
+        async with self._async_generation_lock(cache_path):
+            if not self._use_cached_generation(cache_path, prompt):
+                response = await self.async_openai_client.images.generate(**_openai_image_params(prompt, size))
+                
+                # Download through the pooled session without blocking the loop
+                await asyncio.to_thread(self._store_generation, response, cache_path, prompt, size)
         
-        # Generate image
-        response = self.openai_client.images.generate(
-            model="dall-e-3",
-            prompt=prompt,
-            size=size,
-            quality="standard",  # Use standard for faster generation
-            n=1
+        # Overlay is CPU-bound PIL work
+        return await asyncio.to_thread(
+            self._finish_openai_generation, cache_path, campaign_brief, product, aspect_ratio
         )
+    
+    def _openai_request(self, campaign_brief: Dict[str, Any], product: Dict[str, Any],
+                        aspect_ratio: str) -> Tuple[str, str, Path]:
+        """Prompt, DALL-E size and cache path for one asset"""
         
-        # Download image
-        image_url = response.data[0].url
-        image_response = requests.get(image_url, timeout=30)
-        image_response.raise_for_status()
+        # Create prompt
+        prompt = self._create_prompt(campaign_brief, product)
         
-        # Save to cache
-        filename = f"openai_{product['name'].replace(' ', '_')}_{aspect_ratio}.png"
-        cache_path = self.cache_dir / filename
+        # Map to OpenAI supported size
+        size = self._openai_size_map[aspect_ratio]
         
-        with open(cache_path, 'wb') as f:
-            f.write(image_response.content)
+        return prompt, size, self._openai_cache_path(prompt, size)
+    
+    def _use_cached_generation(self, cache_path: Path, prompt: str) -> bool:
+        """Whether a fresh cached image can stand in for a new generation"""
+        
+        if self._is_cache_fresh(cache_path):
+            self.logger.info("Using cached OpenAI generation: %s", cache_path)
+            return True
+        
+        self.logger.info("Generating with OpenAI: %s...", prompt[:100])
+        return False
+    
+    def _store_generation(self, response: Any, cache_path: Path, prompt: str, size: str):
+        """Download a generated image into the cache and record what produced it"""
+        
+        self._download_to_cache(response.data[0].url, cache_path)
+        self._write_cache_sidecar(cache_path, prompt, size)
+    
+    def _finish_openai_generation(self, cache_path: Path, campaign_brief: Dict[str, Any],
+                                  product: Dict[str, Any], aspect_ratio: str) -> str:
+        """Apply the text overlay to a cached generation"""
         
-        # Apply text overlay
         final_path = self._apply_text_overlay(
             str(cache_path), campaign_brief, product, aspect_ratio
         )
         
-        self.logger.info(f"OpenAI generation successful: {final_path}")
+        self.logger.info("OpenAI generation successful: %s", final_path)
         return final_path
     
+    def _openai_cache_path(self, prompt: str, size: str) -> Path:
+        """Content-addressed cache: identical (prompt, size) requests reuse the image"""
+        
+        key = hashlib.sha256(f"{prompt}|{size}".encode()).hexdigest()[:16]
+        return self.cache_dir / f"openai_{key}.png"
+    
+    def _generation_lock(self, cache_path: Path) -> threading.Lock:
+        """Lock serializing generation of one cached image"""
+        
+        with self._generation_locks_guard:
+            return self._generation_locks.setdefault(cache_path, threading.Lock())
+    
+    def _async_generation_lock(self, cache_path: Path) -> asyncio.Lock:
+        """Lock serializing generation of one cached image across coroutines on the running loop"""
+        
+        locks = self._async_generation_locks.setdefault(asyncio.get_running_loop(), {})
+        return locks.setdefault(cache_path, asyncio.Lock())
+    
+    def _download_to_cache(self, image_url: str, cache_path: Path):
+        """Stream image to cache; rename on completion so partial downloads never look cached"""
+        
+        # Unique per download, so concurrent writers to the same cache path never share a temp file
+        partial_path = cache_path.with_suffix(f'.{uuid.uuid4().hex[:8]}.part')
+        try:
+            with self._http.get(image_url, timeout=30, stream=True) as image_response:
+                image_response.raise_for_status()
+                with open(partial_path, 'wb') as f:
+                    for chunk in image_response.iter_content(chunk_size=65536):
+                        f.write(chunk)
+            os.replace(partial_path, cache_path)
+        except BaseException:
+            # Don't leave an orphaned temp file per failed download
+            partial_path.unlink(missing_ok=True)
+            raise
+    
+    def _write_cache_sidecar(self, cache_path: Path, prompt: str, size: str):
+        """Sidecar describing what produced the cached image"""
+        
+        with open(cache_path.with_suffix('.json'), 'w', encoding='utf-8') as f:
+            json.dump({"prompt": prompt, "size": size, "timestamp": time.time()}, f,
+                      indent=2, ensure_ascii=False)
+    
+    def _is_cache_fresh(self, cache_path: Path) -> bool:
+        """Check whether a cached generation exists and is within the configured max age"""
+        
+        try:
+            stat = cache_path.stat()
+        except FileNotFoundError:
+            return False
+        
+        if stat.st_size == 0:
+            return False
+        
+        max_age = self.config["ai_providers"]["openai"].get("cache_max_age_seconds")
+        if max_age and time.time() - stat.st_mtime > max_age:
+            return False
+        
+        return True
+    
     def _generate_with_stability(self, campaign_brief: Dict[str, Any],
                                 product: Dict[str, Any], aspect_ratio: str) -> str:
         """Generate with Stability AI (placeholder - creates demo asset)"""
@@ -172,21 +596,13 @@ class AssetGenerator:
         # For demo purposes, create a placeholder that looks like AI generated
         config = self.aspect_configs[aspect_ratio]
         
-        # Create gradient background (looks more "AI generated")
-        image = Image.new('RGB', (config["width"], config["height"]), (180, 200, 240))
-        draw = ImageDraw.Draw(image)
-        
-        # Add some visual elements to make it look generated
-        center_x, center_y = config["width"] // 2, config["height"] // 2
+        # Create background with a radial highlight (looks more "AI generated")
+        background = np.array([180, 200, 240], dtype=np.float32)
+        highlight = np.array([200, 220, 240], dtype=np.float32)
         
-        # Draw some circles for visual interest
-        for i in range(3):
-            radius = 50 + i * 30
-            color = (160 + i * 20, 180 + i * 20, 220 + i * 10)
-            draw.ellipse([
-                center_x - radius, center_y - radius,
-                center_x + radius, center_y + radius
-            ], fill=color)
+        rgb = _radial_highlight(config["width"], config["height"], background, highlight, 110.0)
+        image = Image.fromarray(rgb, 'RGB')
+        draw = ImageDraw.Draw(image)
         
         # Add product name
         draw.text((50, 50), f"AI Generated: {product['name']}", 
@@ -195,7 +611,7 @@ class AssetGenerator:
         # Save
         filename = f"stability_{product['name'].replace(' ', '_')}_{aspect_ratio}.png"
         cache_path = self.cache_dir / filename
-        image.save(cache_path, 'PNG')
+        image.save(cache_path, 'PNG', compress_level=1)  # Intermediate file; favor encode speed
         
         # Apply text overlay
         final_path = self._apply_text_overlay(
@@ -207,7 +623,7 @@ class AssetGenerator:
     def _use_fallback_asset(self, product: Dict[str, Any], aspect_ratio: str) -> str:
         """Use pre-generated fallback asset"""
         
-        self.logger.info(f"Using fallback asset for {product['name']}_{aspect_ratio}")
+        self.logger.info("Using fallback asset for %s_%s", product['name'], aspect_ratio)
         
         # Look for existing fallback
         fallback_filename = f"fallback_{product['name'].replace(' ', '_')}_{aspect_ratio}.png"
@@ -222,29 +638,13 @@ class AssetGenerator:
     def _create_emergency_fallback(self, product: Dict[str, Any], aspect_ratio: str) -> str:
         """Create emergency fallback when everything else fails"""
         
-        config = self.aspect_configs[aspect_ratio]
-        
-        # Create simple but professional looking asset
-        image = Image.new('RGB', (config["width"], config["height"]), (240, 240, 240))
-        draw = ImageDraw.Draw(image)
-        
-        # Add product name centered
-        text = product['name']
-        bbox = draw.textbbox((0, 0), text, font=self.font)
-        text_width = bbox[2] - bbox[0]
-        text_height = bbox[3] - bbox[1]
-        
-        x = (config["width"] - text_width) // 2
-        y = (config["height"] - text_height) // 2
-        
-        # Draw with shadow
-        draw.text((x + 2, y + 2), text, font=self.font, fill=(200, 200, 200))
-        draw.text((x, y), text, font=self.font, fill=(60, 60, 60))
-        
-        # Save emergency fallback
+        # Simple but professional looking asset: product name centered, with shadow
         filename = f"emergency_{product['name'].replace(' ', '_')}_{aspect_ratio}.png"
         emergency_path = self.fallback_dir / filename
-        image.save(emergency_path, 'PNG')
+        self._card_renderers[aspect_ratio](
+            product['name'], emergency_path,
+            background=(240, 240, 240), fill=(60, 60, 60), shadow=(200, 200, 200)
+        )
         
         return str(emergency_path)
     
@@ -254,91 +654,90 @@ class AssetGenerator:
         
         try:
             # Load base image
-            image = Image.open(base_image_path).convert('RGBA')
+            image = Image.open(base_image_path).convert('RGB')
             config = self.aspect_configs[aspect_ratio]
             
-            # Resize to exact specifications
-            image = image.resize((config["width"], config["height"]), Image.Resampling.LANCZOS)
-            
-            # Create text overlay
-            overlay = Image.new('RGBA', image.size, (0, 0, 0, 0))
-            draw = ImageDraw.Draw(overlay)
+            # Resize to exact specifications (skipped when the source already matches)
+            target_size = (config["width"], config["height"])
+            if image.size != target_size:
+                image = image.resize(target_size, Image.Resampling.LANCZOS)
             
             # Get campaign message
             message = campaign_brief.get("campaign_message", "")
             if message:
                 # Position text based on aspect ratio
-                if aspect_ratio == "story":  # 9:16 - vertical
-                    text_y = config["height"] - 200
-                elif aspect_ratio == "landscape":  # 16:9 - horizontal
-                    text_y = config["height"] - 120
-                else:  # 1:1 - square
-                    text_y = config["height"] - 150
+                text_x, text_y = 50, self._text_y_positions[aspect_ratio]
+                x0, y0, x1, y1 = _text_bbox(message)
                 
-                text_x = 50
+                # Translucent drop shadow: blend black through a text-shaped mask over the text band only
+                shadow_mask = Image.new('L', (x1 - x0, y1 - y0), 0)
+                ImageDraw.Draw(shadow_mask).text((-x0, -y0), message, font=self.font, fill=180)
+                image.paste((0, 0, 0), (text_x + x0 + 2, text_y + y0 + 2), shadow_mask)
                 
-                # Draw text with shadow
-                draw.text((text_x + 2, text_y + 2), message, 
-                         font=self.font, fill=(0, 0, 0, 180))  # Shadow
-                draw.text((text_x, text_y), message, 
-                         font=self.font, fill=(255, 255, 255, 255))  # Main text
-            
-            # Composite final image
-            final_image = Image.alpha_composite(image, overlay)
-            final_image = final_image.convert('RGB')
+                # Main text, drawn directly on the RGB canvas
+                ImageDraw.Draw(image).text((text_x, text_y), message, 
+                                           font=self.font, fill=(255, 255, 255))
             
             # Save final result
             output_filename = f"{product['name'].replace(' ', '_')}_{aspect_ratio}_final.png"
             output_path = self.output_dir / output_filename
-            final_image.save(output_path, 'PNG', quality=95)
+            image.save(output_path, 'PNG', compress_level=6)
             
             return str(output_path)
             
         except Exception as e:
-            self.logger.warning(f"Text overlay failed: {e}")
+            self.logger.warning("Text overlay failed: %s", e)
             return base_image_path
     
     def _create_prompt(self, campaign_brief: Dict[str, Any], product: Dict[str, Any]) -> str:
         """Create AI generation prompt"""
         
-        target_region = campaign_brief.get("target_region", "global")
-        target_audience = campaign_brief.get("target_audience", "consumers")
+        return _build_prompt(
+            product['name'],
+            campaign_brief.get("target_region", "global"),
+            campaign_brief.get("target_audience", "consumers")
+        )
+    
+    def _make_card_renderer(self, width: int, height: int):
+        """Build a text card renderer with the canvas size baked in"""
         
-        prompt_parts = [
-            f"Professional product photography of {product['name']}",
-            f"for {target_audience} in {target_region}",
-            "high quality, clean background",
-            "suitable for social media marketing"
-        ]
+        def render(text: str, filepath: Path, background: tuple = (220, 220, 220),
+                   fill: tuple = (100, 100, 100), shadow: Optional[tuple] = None):
+            image = Image.new('RGB', (width, height), background)
+            draw = ImageDraw.Draw(image)
+            
+            # Center text on the card
+            text_width, text_height = _text_size(text)
+            x = (width - text_width) // 2
+            y = (height - text_height) // 2
+            
+            if shadow:
+                draw.text((x + 2, y + 2), text, font=self.font, fill=shadow)
+            draw.text((x, y), text, font=self.font, fill=fill)
+            
+            image.save(filepath, 'PNG', compress_level=1)
         
-        return ", ".join(prompt_parts)
+        return render
     
     def _ensure_fallback_assets(self):
         """Create basic fallback assets if they don't exist"""
         
-        sample_products = ["Coca Cola", "Nike Shoes", "iPhone"]
-        
-        for product_name in sample_products:
-            for aspect_key, config in self.aspect_configs.items():
-                filename = f"fallback_{product_name.replace(' ', '_')}_{aspect_key}.png"
-                filepath = self.fallback_dir / filename
-                
-                if not filepath.exists():
-                    # Create simple fallback
-                    image = Image.new('RGB', (config["width"], config["height"]), (220, 220, 220))
-                    draw = ImageDraw.Draw(image)
-                    
-                    # Add product name
-                    text = f"Fallback: {product_name}"
-                    bbox = draw.textbbox((0, 0), text, font=self.font)
-                    text_width = bbox[2] - bbox[0]
-                    text_height = bbox[3] - bbox[1]
-                    
-                    x = (config["width"] - text_width) // 2
-                    y = (config["height"] - text_height) // 2
-                    
-                    draw.text((x, y), text, font=self.font, fill=(100, 100, 100))
+        with _FALLBACK_LOCK:
+            fallback_key = str(self.fallback_dir.resolve())
+            if fallback_key in AssetGenerator._fallback_dirs_ready:
+                return
+            
+            # One directory listing instead of a stat() per product/aspect pair
+            existing = set(os.listdir(self.fallback_dir))
+            sample_products = ["Coca Cola", "Nike Shoes", "iPhone"]
+            
+            for product_name in sample_products:
+                for aspect_key, render_card in self._card_renderers.items():
+                    filename = f"fallback_{product_name.replace(' ', '_')}_{aspect_key}.png"
                     
-                    image.save(filepath, 'PNG')
+                    if filename not in existing:
+                        render_card(f"Fallback: {product_name}", self.fallback_dir / filename)
+            
+            AssetGenerator._fallback_dirs_ready.add(fallback_key)
         
-        self.logger.info("Fallback assets ensured")
\ No newline at end of file
+        self.logger.info("Fallback assets ensured")
@@ -3,12 +3,197 @@ Brand Compliance Checker
 Validates generated assets against brand guidelines and cultural requirements
 """
 
+import bisect
+import functools
 import logging
-from pathlib import Path
-from PIL import Image, ImageStat
-from typing import Dict, List, Any, Optional
+import math
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import numpy as np
+from PIL import Image
+from typing import Dict, Iterator, List, Any, NamedTuple, Optional, Tuple
 import re
 
+# Compliance result codec, re-exported for callers handing results between processes
+from src.result_codec import from_bytes, to_bytes  # noqa: F401
+
+def _compile_patterns(patterns: List[str]) -> Tuple[List[Tuple[str, str]], re.Pattern]:
+    """Compile lowercase patterns into one alternation, one named group per pattern
+    
+    Messages are case-folded before scanning, so no IGNORECASE is needed. Source strings
+    are kept alongside their group names for issue messages.
+    """
+    groups = [(f"p{i}", pattern) for i, pattern in enumerate(patterns)]
+    union = re.compile("|".join(f"(?P<{name}>{pattern})" for name, pattern in groups))
+    return groups, union
+
+def _matched_patterns(pattern_set: Tuple[List[Tuple[str, str]], re.Pattern], message: str) -> List[str]:
+    """Source patterns found in message, in declaration order, from a single scan"""
+    groups, union = pattern_set
+    hits = {match.lastgroup for match in union.finditer(message)}
+    return [pattern for name, pattern in groups if name in hits]
+
+_PROHIBITED_PATTERNS = _compile_patterns([
+    r'\b(free|buy now|limited time|click here)\b',  # Aggressive marketing
+    r'\b(guaranteed|miracle|instant)\b',           # Exaggerated claims
+    r'\b(lose weight|diet pill|supplement)\b'      # Health claims
+])
+
+_CULTURAL_RESTRICTIONS = {
+    "middle_east": _compile_patterns([
+        r'\b(alcohol|beer|wine|party)\b',
+        r'\b(revealing|bikini|shorts)\b'
+    ]),
+    "japan": _compile_patterns([
+        r'\b(aggressive|loud|pushy)\b',
+        r'\b(individual|personal|me)\b'  # Collectivist culture preference
+    ]),
+    "india": _compile_patterns([
+        r'\b(beef|cow|leather)\b',
+        r'\b(left hand|unclean)\b'
+    ])
+}
+
+_CULTURAL_RED_FLAGS = _compile_patterns([
+    r'\b(exotic|primitive|backwards)\b',     # Potentially offensive descriptors
+    r'\b(crazy|insane|mad)\b',               # Mental health sensitivity
+    r'\b(disabled|handicapped|lame)\b'       # Disability sensitivity
+])
+
+_REGION_TRANS = str.maketrans({" ": "_"})
+
+@functools.lru_cache(maxsize=64)
+def normalize_region(region: str) -> str:
+    """Region name as used for cultural adaptation config keys"""
+    return region.casefold().translate(_REGION_TRANS)
+
+def _file_fingerprint(path: str) -> Optional[Tuple[int, int]]:
+    """(mtime_ns, size) identifying the current contents of a file, or None if it can't be stat'ed"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+class CheckResult:
+    """Score and findings of one compliance sub-check"""
+    
+    __slots__ = ("score", "issues", "recommendations", "checks_performed", "skipped")
+    
+    def __init__(self, score: float, issues: Optional[List[str]] = None, skipped: bool = False):
+        self.score = score
+        self.issues = issues if issues is not None else []
+        self.recommendations = []
+        self.checks_performed = []
+        self.skipped = skipped
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Result as the dict stored under compliance_result["checks"]; lists are copied"""
+        result = {
+            "score": self.score,
+            "issues": list(self.issues),
+            "recommendations": list(self.recommendations),
+            "checks_performed": list(self.checks_performed)
+        }
+        if self.skipped:
+            result["skipped"] = True
+        return result
+
+# Sub-check weights for the overall compliance score
+_CHECK_WEIGHTS = {"visual": 0.3, "content": 0.3, "cultural": 0.25, "technical": 0.15}
+
+# Placeholder for image checks skipped because the asset cannot reach minimum_score
+_SKIPPED_FILE_CHECK = CheckResult(0, skipped=True)
+
+# Standard aspect ratios, sorted by log ratio for nearest-neighbor lookup
+_EXPECTED_RATIOS = {"square": 1.0, "story": 0.5625, "landscape": 1.777}
+_RATIO_TABLE = sorted((math.log(ratio), ratio, name) for name, ratio in _EXPECTED_RATIOS.items())
+_LOG_RATIOS = [log_ratio for log_ratio, _, _ in _RATIO_TABLE]
+
+def _nearest_standard_ratio(actual_ratio: float, tolerance: float = 0.05) -> Optional[str]:
+    """Name of the closest standard aspect ratio, or None if it is off by more than tolerance"""
+    log_ratio = math.log(actual_ratio)
+    index = bisect.bisect_left(_LOG_RATIOS, log_ratio)
+    
+    # Only the neighbors on either side of the insertion point can be nearest
+    neighbors = _RATIO_TABLE[max(index - 1, 0):index + 1]
+    _, expected_ratio, name = min(neighbors, key=lambda entry: abs(entry[0] - log_ratio))
+    if abs(actual_ratio - expected_ratio) / expected_ratio <= tolerance:
+        return name
+    return None
+
+# Bounding box for the downsampled copy used in dominant-color analysis
+_COLOR_SAMPLE_SIZE = (128, 128)
+
+# sRGB (D65) to CIE XYZ, and the D65 reference white
+_SRGB_TO_XYZ = np.array([
+    [0.4124564, 0.3575761, 0.1804375],
+    [0.2126729, 0.7151522, 0.0721750],
+    [0.0193339, 0.1191920, 0.9503041]
+])
+_D65_WHITE = np.array([0.95047, 1.0, 1.08883])
+
+def _srgb_to_lab(rgb: np.ndarray) -> np.ndarray:
+    """Convert an (N, 3) array of 0-255 sRGB colors to CIE L*a*b*"""
+    
+    linear = rgb / 255.0
+    linear = np.where(linear <= 0.04045, linear / 12.92, ((linear + 0.055) / 1.055) ** 2.4)
+    
+    xyz = (linear @ _SRGB_TO_XYZ.T) / _D65_WHITE
+    f = np.where(xyz > (6 / 29) ** 3, np.cbrt(xyz), xyz / (3 * (6 / 29) ** 2) + 4 / 29)
+    
+    return np.stack([116 * f[:, 1] - 16, 500 * (f[:, 0] - f[:, 1]), 200 * (f[:, 1] - f[:, 2])], axis=1)
+
+@functools.lru_cache(maxsize=256)
+def _parse_palette(palette: Tuple[str, ...]) -> Tuple[Tuple[int, int, int], ...]:
+    """Parse #RRGGBB brand colors, skipping malformed entries"""
+    
+    brand_rgb = []
+    for color in palette:
+        if color.startswith('#') and len(color) == 7:
+            try:
+                brand_rgb.append(tuple(bytes.fromhex(color[1:])))
+            except ValueError:
+                continue
+    return tuple(brand_rgb)
+
+@functools.lru_cache(maxsize=256)
+def _palette_lab(palette: Tuple[str, ...]) -> Optional[np.ndarray]:
+    """Brand palette in CIE L*a*b*, or None if it has no usable colors"""
+    
+    brand_rgb = _parse_palette(palette)
+    if not brand_rgb:
+        return None
+    
+    brand_lab = _srgb_to_lab(np.asarray(brand_rgb, dtype=np.float64))
+    brand_lab.setflags(write=False)  # Shared between callers
+    return brand_lab
+
+@functools.lru_cache(maxsize=None)
+def _file_check_executor() -> ThreadPoolExecutor:
+    """Shared pool for file checks, created on first use"""
+    return ThreadPoolExecutor(max_workers=4, thread_name_prefix="compliance-io")
+
+class _BriefContext(NamedTuple):
+    """Brief inputs shared by every asset check, normalized once per brief"""
+    message: str                                # Case-folded campaign message
+    region: str                                 # Region key as used in cultural config
+    brand_colors: Tuple[str, ...]               # Raw brand palette entries
+    palette_error: Optional[Exception] = None   # Why the palette couldn't be read, if it couldn't
+
+# Per-process checker used by check_batch workers
+_batch_checker = None
+
+def _init_batch_worker(config: Dict[str, Any]):
+    """Build the worker's checker once; its memoized sub-checks then persist across tasks"""
+    global _batch_checker
+    _batch_checker = BrandComplianceChecker(config)
+
+def _check_in_batch_worker(item: Tuple[str, Dict[str, Any], Dict[str, Any]]) -> Dict[str, Any]:
+    """Check one (asset_path, campaign_brief, product) item in a batch worker"""
+    return _batch_checker.check_asset_compliance(*item)
+
 class BrandComplianceChecker:
     """Enterprise brand compliance validation system"""
     
@@ -19,30 +204,46 @@ class BrandComplianceChecker:
         self.cultural_config = config.get("cultural_adaptation", {})
         
         # Load prohibited content patterns
-        self.prohibited_patterns = [
-            r'\b(free|buy now|limited time|click here)\b',  # Aggressive marketing
-            r'\b(guaranteed|miracle|instant)\b',           # Exaggerated claims
-            r'\b(lose weight|diet pill|supplement)\b'      # Health claims
-        ]
+        self.prohibited_patterns = _PROHIBITED_PATTERNS
         
         # Cultural sensitivity patterns by region
-        self.cultural_restrictions = {
-            "middle_east": [
-                r'\b(alcohol|beer|wine|party)\b',
-                r'\b(revealing|bikini|shorts)\b'
-            ],
-            "japan": [
-                r'\b(aggressive|loud|pushy)\b',
-                r'\b(individual|personal|me)\b'  # Collectivist culture preference
-            ],
-            "india": [
-                r'\b(beef|cow|leather)\b',
-                r'\b(left hand|unclean)\b'
-            ]
-        }
+        self.cultural_restrictions = _CULTURAL_RESTRICTIONS
+        
+        # One substring alternation per region, so a single scan finds any cultural keyword
+        self.cultural_keyword_patterns = {}
+        for region, region_config in self.cultural_config.get("regions", {}).items():
+            keywords = region_config.get("cultural_keywords", [])
+            pattern = re.compile("|".join(re.escape(keyword) for keyword in keywords)) if keywords else None
+            self.cultural_keyword_patterns[region] = (keywords, pattern)
+        
+        # Memoized sub-checks; file checks are keyed on (path, mtime, size) so edits invalidate them.
+        # Cached CheckResults are shared and never mutated; to_dict() copies them for callers
+        cache_size = self.compliance_config.get("check_cache_size", 4096)
+        self._cached_file_compliance = functools.lru_cache(maxsize=cache_size)(self._file_compliance)
+        self._cached_content_compliance = functools.lru_cache(maxsize=cache_size)(self._content_compliance)
+        self._cached_cultural_compliance = functools.lru_cache(maxsize=cache_size)(self._cultural_compliance)
+    
+    def build_brief_context(self, campaign_brief: Dict[str, Any]) -> _BriefContext:
+        """Extract the brief inputs every asset check scans; build once and reuse across variants"""
+        
+        # A malformed palette only fails the visual check, as when it was read there
+        brand_colors, palette_error = (), None
+        try:
+            brand_colors = tuple(campaign_brief.get("brand_guidelines", {}).get("color_palette", []))
+            hash(brand_colors)
+        except (AttributeError, TypeError) as e:
+            brand_colors, palette_error = (), e
+        
+        return _BriefContext(
+            message=campaign_brief.get("campaign_message", "").casefold(),
+            region=normalize_region(campaign_brief.get("target_region", "")),
+            brand_colors=brand_colors,
+            palette_error=palette_error
+        )
     
     def check_asset_compliance(self, asset_path: str, campaign_brief: Dict[str, Any], 
-                              product: Dict[str, Any]) -> Dict[str, Any]:
+                              product: Dict[str, Any],
+                              context: Optional[_BriefContext] = None) -> Dict[str, Any]:
         """Comprehensive compliance check for generated asset"""
         
         compliance_result = {
@@ -59,38 +260,65 @@ class BrandComplianceChecker:
         }
         
         try:
-            # Visual compliance checks
-            visual_score = self._check_visual_compliance(asset_path, campaign_brief)
-            compliance_result["checks"]["visual_compliance"] = visual_score
+            if context is None:
+                context = self.build_brief_context(campaign_brief)
+            
+            minimum_score = self.compliance_config.get("minimum_score", 85)
+            short_circuit = self.compliance_config.get("short_circuit_failures", False)
+            
+            # Visual and technical checks share one stat and one image decode; start the I/O-bound
+            # file work first and overlap it with the text checks, unless it may be skipped
+            file_checks = None
+            if not short_circuit:
+                file_checks = _file_check_executor().submit(self._check_file_compliance, asset_path, context)
             
             # Content compliance checks
-            content_score = self._check_content_compliance(campaign_brief, product)
-            compliance_result["checks"]["content_compliance"] = content_score
+            content_score = self._check_content_compliance(context, product)
             
             # Cultural compliance checks
-            cultural_score = self._check_cultural_compliance(campaign_brief)
-            compliance_result["checks"]["cultural_compliance"] = cultural_score
+            cultural_score = self._check_cultural_compliance(context)
+            
+            text_score = (
+                content_score.score * _CHECK_WEIGHTS["content"] +
+                cultural_score.score * _CHECK_WEIGHTS["cultural"]
+            )
             
-            # Technical compliance checks
-            technical_score = self._check_technical_compliance(asset_path)
-            compliance_result["checks"]["technical_compliance"] = technical_score
+            # Best case for the image checks is full marks on both
+            max_reachable = text_score + 100 * (_CHECK_WEIGHTS["visual"] + _CHECK_WEIGHTS["technical"])
+            if short_circuit and max_reachable < minimum_score:
+                visual_score = technical_score = _SKIPPED_FILE_CHECK
+                compliance_result["issues"].append(
+                    f"Visual and technical checks skipped: maximum reachable score {max_reachable:.1f} "
+                    f"is below minimum {minimum_score}"
+                )
+            elif file_checks is not None:
+                visual_score, technical_score = file_checks.result()
+            else:
+                visual_score, technical_score = self._check_file_compliance(asset_path, context)
+            
+            check_results = {
+                "visual_compliance": visual_score,
+                "content_compliance": content_score,
+                "cultural_compliance": cultural_score,
+                "technical_compliance": technical_score
+            }
             
             # Calculate overall score (weighted average)
-            weights = {"visual": 0.3, "content": 0.3, "cultural": 0.25, "technical": 0.15}
             overall_score = (
-                visual_score["score"] * weights["visual"] +
-                content_score["score"] * weights["content"] +
-                cultural_score["score"] * weights["cultural"] +
-                technical_score["score"] * weights["technical"]
+                visual_score.score * _CHECK_WEIGHTS["visual"] +
+                content_score.score * _CHECK_WEIGHTS["content"] +
+                cultural_score.score * _CHECK_WEIGHTS["cultural"] +
+                technical_score.score * _CHECK_WEIGHTS["technical"]
             )
             
             compliance_result["overall_score"] = round(overall_score, 1)
-            compliance_result["passed"] = overall_score >= self.compliance_config.get("minimum_score", 85)
+            compliance_result["passed"] = overall_score >= minimum_score
             
-            # Collect issues and recommendations
-            for check_type, results in compliance_result["checks"].items():
-                compliance_result["issues"].extend(results.get("issues", []))
-                compliance_result["recommendations"].extend(results.get("recommendations", []))
+            # Convert to dicts at the public boundary and collect issues and recommendations
+            for check_type, results in check_results.items():
+                compliance_result["checks"][check_type] = results.to_dict()
+                compliance_result["issues"].extend(results.issues)
+                compliance_result["recommendations"].extend(results.recommendations)
             
             self.logger.info(f"Compliance check completed: {overall_score}/100")
             
@@ -101,205 +329,216 @@ class BrandComplianceChecker:
         
         return compliance_result
     
-    def _check_visual_compliance(self, asset_path: str, campaign_brief: Dict[str, Any]) -> Dict[str, Any]:
-        """Check visual brand compliance"""
+    def check_batch(self, items: List[Tuple[str, Dict[str, Any], Dict[str, Any]]],
+                    workers: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Check (asset_path, campaign_brief, product) items across worker processes, in input order"""
         
-        result = {
-            "score": 85,  # Default score
-            "issues": [],
-            "recommendations": [],
-            "checks_performed": []
-        }
+        if not items:
+            return []
+        
+        workers = workers or os.cpu_count() or 1
+        
+        # Chunk to amortize IPC while still giving every worker a few chunks
+        chunksize = max(1, min(8, len(items) // (workers * 4)))
+        
+        # Spawn rather than fork: callers are multi-threaded, and a forked worker inherits
+        # other threads' locks but not the threads that would release them
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                                 initializer=_init_batch_worker, initargs=(self.config,)) as executor:
+            return list(executor.map(_check_in_batch_worker, items, chunksize=chunksize))
+    
+    def _check_file_compliance(self, asset_path: str,
+                               context: _BriefContext) -> Tuple[CheckResult, CheckResult]:
+        """Check visual brand compliance and technical specifications of an asset file"""
+        
+        fingerprint = _file_fingerprint(asset_path)
+        if fingerprint is None:
+            return CheckResult(0, ["Asset file not found"]), CheckResult(0, ["Asset file does not exist"])
+        
+        if context.palette_error is not None:
+            return self._file_compliance(asset_path, fingerprint, context.brand_colors, context.palette_error)
+        
+        return self._cached_file_compliance(asset_path, fingerprint, context.brand_colors)
+    
+    def _file_compliance(self, asset_path: str, fingerprint: Tuple[int, int], brand_colors: Tuple[str, ...],
+                         palette_error: Optional[Exception] = None) -> Tuple[CheckResult, CheckResult]:
+        """Visual and technical checks for one version of an asset file"""
         
+        # Header only; pixels are decoded later if the visual check needs them
+        image, image_error = None, None
         try:
-            if not Path(asset_path).exists():
-                result["score"] = 0
-                result["issues"].append("Asset file not found")
-                return result
-            
             image = Image.open(asset_path)
+        except Exception as e:
+            image_error = e
+        
+        try:
+            return (
+                self._visual_compliance(image, image_error or palette_error, brand_colors),
+                self._technical_compliance(image, image_error, fingerprint[1])
+            )
+        finally:
+            if image is not None:
+                image.close()
+    
+    def _visual_compliance(self, image: Optional[Image.Image], image_error: Optional[Exception],
+                           brand_colors: Tuple[str, ...]) -> CheckResult:
+        """Check visual brand compliance"""
+        
+        result = CheckResult(85)  # Default score
+        
+        try:
+            if image_error is not None:
+                raise image_error
             
             # Image quality checks
             if image.width < 800 or image.height < 600:
-                result["score"] -= 10
-                result["issues"].append("Image resolution below recommended minimum")
-                result["recommendations"].append("Use higher resolution images for better quality")
+                result.score -= 10
+                result.issues.append("Image resolution below recommended minimum")
+                result.recommendations.append("Use higher resolution images for better quality")
             else:
-                result["checks_performed"].append("Resolution check passed")
-            
-            # Color analysis (basic)
-            colors = self._analyze_dominant_colors(image)
-            brand_colors = campaign_brief.get("brand_guidelines", {}).get("color_palette", [])
+                result.checks_performed.append("Resolution check passed")
             
-            if brand_colors and not self._colors_compatible(colors, brand_colors):
-                result["score"] -= 15
-                result["issues"].append("Generated colors don't align with brand palette")
-                result["recommendations"].append("Adjust prompt to specify brand colors")
+            # Color analysis (basic); only decode pixels when there is a usable palette to compare against
+            if (_palette_lab(brand_colors) is not None
+                    and not self._colors_compatible(self._analyze_dominant_colors(image), brand_colors)):
+                result.score -= 15
+                result.issues.append("Generated colors don't align with brand palette")
+                result.recommendations.append("Adjust prompt to specify brand colors")
             else:
-                result["checks_performed"].append("Color alignment acceptable")
+                result.checks_performed.append("Color alignment acceptable")
             
-            # Aspect ratio validation
-            expected_ratios = {"square": 1.0, "story": 0.5625, "landscape": 1.777}
+            # Aspect ratio validation against the nearest standard ratio (within 5% tolerance)
             actual_ratio = image.width / image.height
-            
-            # Check if close to any expected ratio (within 5% tolerance)
-            ratio_match = False
-            for ratio_name, expected_ratio in expected_ratios.items():
-                if abs(actual_ratio - expected_ratio) / expected_ratio <= 0.05:
-                    ratio_match = True
-                    result["checks_performed"].append(f"Aspect ratio matches {ratio_name}")
-                    break
+            ratio_name = _nearest_standard_ratio(actual_ratio)
+            ratio_match = ratio_name is not None
+            if ratio_match:
+                result.checks_performed.append(f"Aspect ratio matches {ratio_name}")
             
             if not ratio_match:
-                result["score"] -= 10
-                result["issues"].append(f"Aspect ratio {actual_ratio:.3f} doesn't match standard formats")
+                result.score -= 10
+                result.issues.append(f"Aspect ratio {actual_ratio:.3f} doesn't match standard formats")
             
         except Exception as e:
-            result["score"] = 50
-            result["issues"].append(f"Visual analysis failed: {str(e)}")
+            result.score = 50
+            result.issues.append(f"Visual analysis failed: {str(e)}")
         
         return result
     
-    def _check_content_compliance(self, campaign_brief: Dict[str, Any], 
-                                 product: Dict[str, Any]) -> Dict[str, Any]:
+    def _check_content_compliance(self, context: _BriefContext, product: Dict[str, Any]) -> CheckResult:
         """Check content and messaging compliance"""
         
-        result = {
-            "score": 90,  # Start high, deduct for issues
-            "issues": [],
-            "recommendations": [],
-            "checks_performed": []
-        }
+        return self._cached_content_compliance(context.message, product.get("name", ""))
+    
+    def _content_compliance(self, message: str, product_name: str) -> CheckResult:
+        """Content checks for one (case-folded message, product name) pair"""
         
-        message = campaign_brief.get("campaign_message", "").lower()
+        result = CheckResult(90)  # Start high, deduct for issues
         
         # Check for prohibited content patterns
-        for pattern in self.prohibited_patterns:
-            if re.search(pattern, message, re.IGNORECASE):
-                result["score"] -= 20
-                result["issues"].append(f"Prohibited content detected: {pattern}")
-                result["recommendations"].append("Remove prohibited marketing language")
+        for pattern in _matched_patterns(self.prohibited_patterns, message):
+            result.score -= 20
+            result.issues.append(f"Prohibited content detected: {pattern}")
+            result.recommendations.append("Remove prohibited marketing language")
         
-        if not result["issues"]:
-            result["checks_performed"].append("Content screening passed")
+        if not result.issues:
+            result.checks_performed.append("Content screening passed")
         
         # Message length validation
         if len(message) > 100:
-            result["score"] -= 5
-            result["issues"].append("Campaign message may be too long for social media")
-            result["recommendations"].append("Consider shortening message for better engagement")
+            result.score -= 5
+            result.issues.append("Campaign message may be too long for social media")
+            result.recommendations.append("Consider shortening message for better engagement")
         elif len(message) < 10:
-            result["score"] -= 10
-            result["issues"].append("Campaign message is too short")
-            result["recommendations"].append("Provide more descriptive campaign message")
+            result.score -= 10
+            result.issues.append("Campaign message is too short")
+            result.recommendations.append("Provide more descriptive campaign message")
         else:
-            result["checks_performed"].append("Message length appropriate")
+            result.checks_performed.append("Message length appropriate")
         
         # Brand name consistency
-        product_name = product.get("name", "").lower()
-        if product_name and product_name not in message:
-            result["score"] -= 5
-            result["recommendations"].append(f"Consider mentioning '{product['name']}' in campaign message")
+        if product_name and product_name.casefold() not in message:
+            result.score -= 5
+            result.recommendations.append(f"Consider mentioning '{product_name}' in campaign message")
         
         return result
     
-    def _check_cultural_compliance(self, campaign_brief: Dict[str, Any]) -> Dict[str, Any]:
+    def _check_cultural_compliance(self, context: _BriefContext) -> CheckResult:
         """Check cultural sensitivity and regional compliance"""
         
-        result = {
-            "score": 95,  # Start very high, deduct for cultural issues
-            "issues": [],
-            "recommendations": [],
-            "checks_performed": []
-        }
+        return self._cached_cultural_compliance(context.region, context.message)
+    
+    def _cultural_compliance(self, target_region: str, message: str) -> CheckResult:
+        """Cultural checks for one (normalized region, case-folded message) pair"""
         
-        target_region = campaign_brief.get("target_region", "").lower().replace(" ", "_")
-        message = campaign_brief.get("campaign_message", "").lower()
+        result = CheckResult(95)  # Start very high, deduct for cultural issues
         
         # Check region-specific restrictions
         if target_region in self.cultural_restrictions:
             restrictions = self.cultural_restrictions[target_region]
             
-            for pattern in restrictions:
-                if re.search(pattern, message, re.IGNORECASE):
-                    result["score"] -= 25
-                    result["issues"].append(f"Culturally inappropriate content for {target_region}: {pattern}")
-                    result["recommendations"].append(f"Adapt messaging for {target_region} cultural norms")
+            for pattern in _matched_patterns(restrictions, message):
+                result.score -= 25
+                result.issues.append(f"Culturally inappropriate content for {target_region}: {pattern}")
+                result.recommendations.append(f"Adapt messaging for {target_region} cultural norms")
         
         # General cultural sensitivity checks
-        cultural_red_flags = [
-            r'\b(exotic|primitive|backwards)\b',     # Potentially offensive descriptors
-            r'\b(crazy|insane|mad)\b',               # Mental health sensitivity
-            r'\b(disabled|handicapped|lame)\b'       # Disability sensitivity
-        ]
+        for pattern in _matched_patterns(_CULTURAL_RED_FLAGS, message):
+            result.score -= 15
+            result.issues.append(f"Potentially insensitive language detected: {pattern}")
+            result.recommendations.append("Use more inclusive language")
         
-        for pattern in cultural_red_flags:
-            if re.search(pattern, message, re.IGNORECASE):
-                result["score"] -= 15
-                result["issues"].append(f"Potentially insensitive language detected: {pattern}")
-                result["recommendations"].append("Use more inclusive language")
-        
-        if not result["issues"]:
-            result["checks_performed"].append("Cultural sensitivity screening passed")
+        if not result.issues:
+            result.checks_performed.append("Cultural sensitivity screening passed")
         
         # Regional adaptation recommendations
-        if target_region in self.cultural_config.get("regions", {}):
-            region_config = self.cultural_config["regions"][target_region]
-            cultural_keywords = region_config.get("cultural_keywords", [])
+        if target_region in self.cultural_keyword_patterns:
+            cultural_keywords, keyword_pattern = self.cultural_keyword_patterns[target_region]
             
-            keyword_matches = sum(1 for keyword in cultural_keywords if keyword in message)
-            if keyword_matches == 0:
-                result["recommendations"].append(
+            if keyword_pattern is None or not keyword_pattern.search(message):
+                result.recommendations.append(
                     f"Consider incorporating {target_region} cultural elements: {', '.join(cultural_keywords[:3])}"
                 )
         
         return result
     
-    def _check_technical_compliance(self, asset_path: str) -> Dict[str, Any]:
+    def _technical_compliance(self, image: Optional[Image.Image], image_error: Optional[Exception],
+                              file_size: int) -> CheckResult:
         """Check technical requirements and specifications"""
         
-        result = {
-            "score": 100,  # Start perfect, deduct for technical issues
-            "issues": [],
-            "recommendations": [],
-            "checks_performed": []
-        }
+        result = CheckResult(100)  # Start perfect, deduct for technical issues
         
         try:
-            if not Path(asset_path).exists():
-                result["score"] = 0
-                result["issues"].append("Asset file does not exist")
-                return result
-            
             # File size check
-            file_size_mb = Path(asset_path).stat().st_size / (1024 * 1024)
+            file_size_mb = file_size / (1024 * 1024)
             if file_size_mb > 5.0:
-                result["score"] -= 10
-                result["issues"].append(f"File size ({file_size_mb:.1f}MB) exceeds social media limits")
-                result["recommendations"].append("Optimize image compression")
+                result.score -= 10
+                result.issues.append(f"File size ({file_size_mb:.1f}MB) exceeds social media limits")
+                result.recommendations.append("Optimize image compression")
             else:
-                result["checks_performed"].append("File size appropriate")
+                result.checks_performed.append("File size appropriate")
             
             # Image format validation
-            image = Image.open(asset_path)
+            if image_error is not None:
+                raise image_error
+            
             if image.format not in ['PNG', 'JPEG', 'JPG']:
-                result["score"] -= 5
-                result["issues"].append(f"Image format {image.format} not optimal for web")
-                result["recommendations"].append("Use PNG or JPEG format")
+                result.score -= 5
+                result.issues.append(f"Image format {image.format} not optimal for web")
+                result.recommendations.append("Use PNG or JPEG format")
             else:
-                result["checks_performed"].append("Image format acceptable")
+                result.checks_performed.append("Image format acceptable")
             
             # Color mode validation
             if image.mode not in ['RGB', 'RGBA']:
-                result["score"] -= 10
-                result["issues"].append(f"Color mode {image.mode} not suitable for digital display")
-                result["recommendations"].append("Convert to RGB color mode")
+                result.score -= 10
+                result.issues.append(f"Color mode {image.mode} not suitable for digital display")
+                result.recommendations.append("Convert to RGB color mode")
             else:
-                result["checks_performed"].append("Color mode appropriate")
+                result.checks_performed.append("Color mode appropriate")
             
         except Exception as e:
-            result["score"] = 50
-            result["issues"].append(f"Technical validation failed: {str(e)}")
+            result.score = 50
+            result.issues.append(f"Technical validation failed: {str(e)}")
         
         return result
     
@@ -307,20 +546,22 @@ class BrandComplianceChecker:
         """Extract dominant colors from image (simplified)"""
         
         try:
+            # Sample a thumbnail: the color distribution is stable well below full resolution
+            # and the delta-E threshold downstream is coarse enough to absorb the difference
+            small = image.copy()
+            small.thumbnail(_COLOR_SAMPLE_SIZE, Image.Resampling.BILINEAR)
+            
             # Convert to RGB if necessary
-            if image.mode != 'RGB':
-                image = image.convert('RGB')
+            if small.mode != 'RGB':
+                small = small.convert('RGB')
             
-            # Get color statistics
-            colors = image.getcolors(maxcolors=256*256*256)
-            if colors:
-                # Sort by frequency and get top 3
-                colors.sort(key=lambda x: x[0], reverse=True)
-                return [color[1] for color in colors[:3]]
-            else:
-                # Fallback: get average color
-                stat = ImageStat.Stat(image)
-                return [tuple(stat.mean)]
+            # Reduce to an 8-color palette in C, then rank palette entries by pixel count
+            quantized = small.quantize(colors=8, method=Image.Quantize.FASTOCTREE)
+            palette = quantized.getpalette()
+            
+            # Top 3 by frequency, ties broken by palette index
+            top = sorted(quantized.getcolors(), key=lambda entry: (-entry[0], entry[1]))[:3]
+            return [tuple(palette[index * 3:index * 3 + 3]) for _, index in top]
                 
         except Exception:
             return [(128, 128, 128)]  # Default gray
@@ -328,60 +569,43 @@ class BrandComplianceChecker:
     def _colors_compatible(self, image_colors: List[tuple], brand_colors: List[str]) -> bool:
         """Check if image colors are compatible with brand palette (simplified)"""
         
-        # Convert brand colors from hex to RGB (simplified)
-        brand_rgb = []
-        for color in brand_colors:
-            if color.startswith('#') and len(color) == 7:
-                try:
-                    r = int(color[1:3], 16)
-                    g = int(color[3:5], 16)
-                    b = int(color[5:7], 16)
-                    brand_rgb.append((r, g, b))
-                except ValueError:
-                    continue
-        
-        if not brand_rgb:
+        brand_lab = _palette_lab(tuple(brand_colors))
+        if brand_lab is None:
             return True  # No brand colors defined, assume compatible
         
-        # Simple compatibility check: see if any image color is close to brand colors
-        for img_color in image_colors:
-            for brand_color in brand_rgb:
-                # Calculate color distance (simplified)
-                distance = sum(abs(a - b) for a, b in zip(img_color, brand_color))
-                if distance < 100:  # Threshold for "similar"
-                    return True
+        # Compatible if any image color is perceptually close (CIE76 delta E) to a brand color
+        image_lab = _srgb_to_lab(np.asarray(image_colors, dtype=np.float64).reshape(-1, 3))
         
-        return False
+        delta_e = np.linalg.norm(image_lab[:, None, :] - brand_lab[None, :, :], axis=2)
+        return bool((delta_e < self.compliance_config.get("color_delta_e_threshold", 10.0)).any())
     
     def generate_compliance_report(self, results: Dict[str, Any]) -> str:
         """Generate human-readable compliance report"""
         
-        report_lines = [
-            "=== BRAND COMPLIANCE REPORT ===",
-            f"Overall Score: {results['overall_score']}/100",
-            f"Status: {'✅ PASSED' if results['passed'] else '❌ FAILED'}",
-            ""
-        ]
+        return "\n".join(self._report_lines(results))
+    
+    def _report_lines(self, results: Dict[str, Any]) -> Iterator[str]:
+        """Yield compliance report lines in display order"""
+        
+        yield "=== BRAND COMPLIANCE REPORT ==="
+        yield f"Overall Score: {results['overall_score']}/100"
+        yield f"Status: {'✅ PASSED' if results['passed'] else '❌ FAILED'}"
+        yield ""
         
         # Add check results
         for check_type, check_results in results["checks"].items():
             check_name = check_type.replace('_', ' ').title()
-            report_lines.append(f"{check_name}: {check_results['score']}/100")
-            
-            if check_results.get("checks_performed"):
-                for check in check_results["checks_performed"]:
-                    report_lines.append(f"  ✅ {check}")
+            yield f"{check_name}: {check_results['score']}/100"
+            yield from (f"  ✅ {check}" for check in check_results.get("checks_performed") or ())
         
         # Add issues
         if results["issues"]:
-            report_lines.extend(["", "Issues Found:"])
-            for issue in results["issues"]:
-                report_lines.append(f"  ⚠️  {issue}")
+            yield ""
+            yield "Issues Found:"
+            yield from (f"  ⚠️  {issue}" for issue in results["issues"])
         
         # Add recommendations
         if results["recommendations"]:
-            report_lines.extend(["", "Recommendations:"])
-            for rec in results["recommendations"]:
-                report_lines.append(f"  💡 {rec}")
-        
-        return "\n".join(report_lines)
\ No newline at end of file
+            yield ""
+            yield "Recommendations:"
+            yield from (f"  💡 {rec}" for rec in results["recommendations"])
\ No newline at end of file
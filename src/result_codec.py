@@ -0,0 +1,30 @@
+"""
+Result Codec
+JSON encoding for campaign and compliance results, using orjson when installed
+"""
+
+import json
+from typing import Any, Dict
+
+# Optional faster JSON codec
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def to_bytes(result: Dict[str, Any], indent: bool = False) -> bytes:
+    """Serialize a result to UTF-8 JSON, compact unless indent is set"""
+    
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(result, option=option, default=str)
+    
+    return json.dumps(result, indent=2 if indent else None, separators=None if indent else (',', ':'),
+                      ensure_ascii=False, default=str).encode('utf-8')
+
+def from_bytes(data: bytes) -> Dict[str, Any]:
+    """Deserialize a result produced by to_bytes"""
+    
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -2,8 +2,12 @@
 Workflow Integrator
 Simulates stakeholder notifications and approval chains.
 """
+import logging
+
+logger = logging.getLogger(__name__)
+
 def notify(role, message):
-    print(f"[{role}] {message}")
+    logger.info("[%s] %s", role, message)
 
 def approval_sim(product_id):
     notify("Creative Director", f"Approved visuals for {product_id}")
@@ -0,0 +1,29 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image
+
+from src.compliance_checker import BrandComplianceChecker
+
+
+def test_check_batch_after_in_process_check(tmp_path):
+    asset_path = tmp_path / "asset.png"
+    Image.new("RGB", (1080, 1080), (220, 30, 40)).save(asset_path)
+    
+    checker = BrandComplianceChecker({})
+    brief = {
+        "campaign_message": "Refresh your day with every sip",
+        "target_region": "North America",
+        "brand_guidelines": {"color_palette": ["#DC1E28"]}
+    }
+    product = {"name": "Coca Cola"}
+    
+    # Starts the shared file-check pool in this process before the batch workers start
+    expected = checker.check_asset_compliance(str(asset_path), brief, product)
+    
+    # Run the batch off-thread so a hung worker fails the test instead of stalling the run
+    with ThreadPoolExecutor(max_workers=1) as runner:
+        results = runner.submit(
+            checker.check_batch, [(str(asset_path), brief, product)] * 2, 2
+        ).result(timeout=60)
+    
+    assert [result["overall_score"] for result in results] == [expected["overall_score"]] * 2